@@ -11,7 +11,6 @@ import shutil
 import os
 from src.models import schemas
 import sys
-from pathlib import Path
 
 # Añadir el directorio raíz al path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -411,7 +410,6 @@ async def cleanup_temp_files():
         # Limpiar carpeta test123
         test_dir = Path("data/raw/test123")
         if test_dir.exists():
-            import shutil
             try:
                 shutil.rmtree(test_dir)
                 deleted_dirs.append(str(test_dir))
@@ -420,7 +418,6 @@ async def cleanup_temp_files():
                 
         test_dir = Path("data/processed/test123")
         if test_dir.exists():
-            import shutil
             try:
                 shutil.rmtree(test_dir)
                 deleted_dirs.append(str(test_dir))
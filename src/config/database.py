@@ -1,25 +1,28 @@
 
 import os
+import threading
+from contextlib import contextmanager
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
 from dotenv import load_dotenv
 import logging
 
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-
-# Example usage
-logging.info("This is an info message")
-logging.error("This is an error message")
-
-
 # Configuración de la base de datos
 DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "5432")
 DB_NAME = os.getenv("DB_NAME", "miresse")
 DB_USER = os.getenv("DB_USER", "postgres")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "")
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "2"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "20"))
+
+# Pool compartido por el proceso; se crea en la primera consulta
+_pool = None
+_pool_lock = threading.Lock()
+# getconn() falla con PoolError si no quedan conexiones libres; el semáforo
+# hace que quien llegue con el pool lleno espere a que se devuelva una
+_pool_slots = threading.BoundedSemaphore(DB_POOL_MAX)
 
 def get_connection():
     """Establece conexión con la base de datos PostgreSQL."""
@@ -33,9 +36,37 @@ def get_connection():
         )
         return conn
     except Exception as e:
-        print(f"Error al conectar a la base de datos: {e}")
+        logging.error("Error al conectar a la base de datos: %s", e)
         raise
 
+def _get_pool():
+    """Devuelve el pool de conexiones, creándolo la primera vez."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadedConnectionPool(
+                DB_POOL_MIN,
+                DB_POOL_MAX,
+                host=DB_HOST,
+                port=DB_PORT,
+                dbname=DB_NAME,
+                user=DB_USER,
+                password=DB_PASSWORD
+            )
+        return _pool
+
+@contextmanager
+def get_conn():
+    """Toma una conexión del pool, esperando si están todas en uso, y la devuelve al terminar."""
+    pool = _get_pool()
+    with _pool_slots:
+        conn = pool.getconn()
+        try:
+            yield conn
+        finally:
+            # Las conexiones rotas se descartan en lugar de volver al pool
+            pool.putconn(conn, close=bool(conn.closed))
+
 def check_connection():
     """
     Verifica si la conexión a la base de datos está funcionando.
@@ -53,18 +84,16 @@ def check_connection():
 
 def execute_query(query, params=None, fetch=True):
     """Ejecuta una consulta en la base de datos."""
-    conn = get_connection()
-    try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-            cursor.execute(query, params or ())
-            conn.commit()
-            if fetch:
-                return cursor.fetchall()
-            return None
-    except Exception as e:
-        conn.rollback()
-        print(f"Error al ejecutar la consulta: {e}")
-        raise
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(query, params or ())
+                conn.commit()
+                if fetch:
+                    return cursor.fetchall()
+                return None
+        except Exception as e:
+            conn.rollback()
+            logging.error("Error al ejecutar la consulta: %s", e)
+            raise
 
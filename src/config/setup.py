@@ -40,4 +40,16 @@ class Settings:
         # Model configurations
         self.WHISPER_MODEL = "medium"
         self.MIN_SILENCE_LENGTH = 3000  # milliseconds
-        self.MAX_VIDEO_DURATION = 600  # seconds
\ No newline at end of file
+        self.MAX_VIDEO_DURATION = 600  # seconds
+        # Altura máxima al descargar de YouTube; el análisis trabaja a baja resolución
+        self.YOUTUBE_MAX_HEIGHT = int(os.getenv('YOUTUBE_MAX_HEIGHT', '720'))
+        # Audiodescripciones (AudioProcessor.generate_description) que se generan a la vez;
+        # el resto espera su turno
+        self.VIDEO_WORKERS = max(1, int(os.getenv('VIDEO_WORKERS', '2')))
+        # Hilos por proceso ffmpeg en la detección de escenas. El reparto supone
+        # VIDEO_WORKERS decodificaciones simultáneas, pero la detección de escenas
+        # no pasa por ese límite: si se lanzan más a la vez, ajustar este valor
+        self.FFMPEG_THREADS = int(os.getenv(
+            'FFMPEG_THREADS',
+            str(max(1, (os.cpu_count() or 4) // self.VIDEO_WORKERS))
+        ))
@@ -1,14 +1,32 @@
 import os
 import logging
+import hashlib
+import shutil
 from pathlib import Path
 from PIL import Image
 import tempfile
 import time
 import json
 import subprocess
+import asyncio
+import cv2
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from gtts import gTTS
 
 class AudioProcessor:
+    # Fotogramas con una distancia de Hamming menor o igual se consideran iguales
+    DUPLICATE_FRAME_DISTANCE = 8
+    DESCRIPTION_CACHE_SIZE = 32
+    # Llamadas simultáneas a Gemini; el coste está en la latencia de red
+    DESCRIPTION_WORKERS = 8
+    # Peticiones simultáneas a gTTS; cada una es una llamada HTTP independiente
+    TTS_WORKERS = 8
+    # Subir la versión al cambiar de motor o formato de voz invalida la caché
+    TTS_CACHE_VERSION = "v1"
+    # Tamaño máximo de la caché de voz; al superarlo se borran los audios usados hace más tiempo
+    TTS_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
     def __init__(self, settings):
         self.settings = settings
         self.tts_client = None
@@ -22,6 +40,19 @@ class AudioProcessor:
         
         self.processing_status = {}  # Almacena el estado de procesamiento por video_id
         
+        # Límite de vídeos procesados a la vez (VIDEO_WORKERS). El semáforo se crea
+        # en el primer uso para que pertenezca al bucle de eventos que lo usa
+        self.video_workers = max(1, int(getattr(settings, "VIDEO_WORKERS", 2)))
+        self._video_slots = None
+        # Un trabajo por video a la vez: comparten la captura de VideoAnalyzer,
+        # que se libera al terminar. Cada entrada es [lock, trabajos que lo usan]
+        # y se borra cuando el último lo suelta
+        self._video_locks = {}
+        
+        # Caché en disco de audios sintetizados, indexada por el contenido del texto
+        data_dir = getattr(settings, "DATA_DIR", None)
+        self.tts_cache_dir = Path(data_dir) / "cache" / "tts" if data_dir is not None else None
+        
         # Crear directorios necesarios
         audio_dir = Path("data/audio")
         audio_dir.mkdir(parents=True, exist_ok=True)
@@ -29,8 +60,35 @@ class AudioProcessor:
         # Configuración TTS simple
         logging.info("Using gTTS for text-to-speech conversion")
     
-    async def generate_description(self, video_id: str, video_path: Path, voice_type: str = "es"):
-        """Genera audiodescripciones para el video"""
+    async def generate_description(self, video_id: str, video_path: Path, voice_type: str = "es", save_frames: bool = False):
+        """Genera audiodescripciones para el video.
+
+        Los fotogramas se pasan en memoria al procesador de texto; solo se
+        guardan en disco como JPEG si se indica ``save_frames=True``.
+
+        El trabajo (decodificación, llamadas a Gemini y gTTS, ffmpeg) es
+        bloqueante, así que se ejecuta en un hilo para no detener el bucle de
+        eventos mientras la API sigue atendiendo peticiones.
+        """
+        if self._video_slots is None:
+            self._video_slots = asyncio.Semaphore(self.video_workers)
+        key = str(video_path)
+        entry = self._video_locks.get(key)
+        if entry is None:
+            entry = self._video_locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            # La espera ocurre en el bucle de eventos, sin ocupar hilos del executor
+            async with entry[0], self._video_slots:
+                return await asyncio.to_thread(self._generate_description, video_id, video_path, voice_type, save_frames)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._video_locks[key]
+
+    def _generate_description(self, video_id: str, video_path: Path, voice_type: str, save_frames: bool):
+        """Cuerpo síncrono de generate_description"""
+        frames = None
         try:
             # Código original para procesamiento real
             # Actualizar estado
@@ -62,27 +120,48 @@ class AudioProcessor:
             timestamps = list(range(0, int(video_duration), frame_interval))
             
             descriptions = []
-            for i, timestamp_sec in enumerate(timestamps):
-                progress = int(10 + (i / len(timestamps)) * 40)  # Progreso entre 10% y 50%
-                self.processing_status[video_id].update({
-                    "progress": progress,
-                    "current_step": f"Analizando escena {i+1} de {len(timestamps)}"
-                })
-                
-                # Extraer frame
-                timestamp_ms = timestamp_sec * 1000
-                frame = self.video_analyzer.extract_frame(video_path, timestamp_ms)
-                
-                if frame:
-                    # Guardar frame para referencia
-                    frame_path = data_dir / f"frame_{i}.jpg"
-                    frame.save(frame_path)
-                    
-                    # Generar descripción usando el procesador de texto (Gemini)
-                    desc_text = self.text_processor.generate_description(frame, frame_interval * 1000)
+            # Descripciones recientes (futuras) por hash perceptual, para no
+            # repetir llamadas a Gemini en fotogramas prácticamente idénticos
+            description_cache = OrderedDict()
+            pending = []
+            # Los fotogramas se leen por lotes en un tensor BGR reservado una vez
+            frames = self.video_analyzer.iter_frames(video_path, [t * 1000 for t in timestamps])
+            with ThreadPoolExecutor(max_workers=self.DESCRIPTION_WORKERS) as executor:
+                for i, (timestamp_ms, frame) in enumerate(frames):
+                    if frame is None:
+                        continue
+
+                    # Guardar frame para referencia solo si se solicita; la codificación
+                    # JPEG libera el GIL, así que se hace en el pool sin frenar la lectura
+                    if save_frames:
+                        frame_path = data_dir / f"frame_{i}.jpg"
+                        executor.submit(cv2.imwrite, str(frame_path), frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
                     
+                    frame_hash = self.video_analyzer.frame_hash(frame)
+                    future = self._find_cached_description(description_cache, frame_hash)
+
+                    if future is None:
+                        # Generar descripción usando el procesador de texto (Gemini) en segundo plano
+                        future = executor.submit(self.text_processor.generate_description, frame, frame_interval * 1000)
+                        description_cache[frame_hash] = future
+                        if len(description_cache) > self.DESCRIPTION_CACHE_SIZE:
+                            description_cache.popitem(last=False)
+                    else:
+                        logging.info(f"Frame at {timestamp_ms // 1000}s is a near-duplicate, reusing description")
+
+                    pending.append((i, timestamp_ms, future))
+
+                # Recoger las descripciones en orden a medida que terminan
+                for n, (i, timestamp_ms, future) in enumerate(pending):
+                    progress = int(10 + (n / len(pending)) * 40)  # Progreso entre 10% y 50%
+                    self.processing_status[video_id].update({
+                        "progress": progress,
+                        "current_step": f"Analizando escena {n+1} de {len(pending)}"
+                    })
+
+                    desc_text = future.result()
                     if desc_text:
-                        logging.info(f"Generated description at {timestamp_sec}s: {desc_text}")
+                        logging.info(f"Generated description at {timestamp_ms // 1000}s: {desc_text}")
                         
                         # Añadir a la lista de descripciones
                         descriptions.append({
@@ -92,6 +171,9 @@ class AudioProcessor:
                             "text": desc_text
                         })
             
+            # Liberar la captura del video, ya no se necesitan más fotogramas
+            self.video_analyzer.close(video_path)
+
             # Guardar descripciones en un archivo JSON
             desc_file = data_dir / "descriptions.json"
             with open(desc_file, 'w', encoding='utf-8') as f:
@@ -106,24 +188,29 @@ class AudioProcessor:
             # Lista para recopilar rutas de audio
             audio_files = []
             
-            for i, desc in enumerate(descriptions):
-                progress = int(50 + (i / len(descriptions)) * 40)  # Progreso entre 50% y 90%
-                self.processing_status[video_id].update({
-                    "progress": progress,
-                    "current_step": f"Generando audio {i+1} de {len(descriptions)}"
-                })
-                
-                # Generar archivo de audio para esta descripción
-                audio_file = f"{video_id}_desc_{desc['id']}.mp3"
-                audio_path = audio_dir / audio_file
-                
-                # Usar gTTS para generar audio
-                tts = gTTS(text=desc['text'], lang=voice_type[:2])  # Tomar solo los 2 primeros caracteres (es-ES -> es)
-                tts.save(str(audio_path))
+            # Las síntesis son independientes, así que se lanzan todas a la vez
+            # y el coste total es el de la red, no la suma de las latencias
+            with ThreadPoolExecutor(max_workers=self.TTS_WORKERS) as executor:
+                futures = []
+                for desc in descriptions:
+                    # Generar archivo de audio para esta descripción
+                    audio_file = f"{video_id}_desc_{desc['id']}.mp3"
+                    audio_path = audio_dir / audio_file
+                    
+                    # Tomar solo los 2 primeros caracteres del idioma (es-ES -> es)
+                    futures.append(executor.submit(self._synthesize_speech, desc['text'], voice_type[:2], audio_path))
+                    
+                    # Añadir ruta de audio a la descripción y a la lista
+                    desc["audio_file"] = str(audio_file)
+                    audio_files.append(audio_path)
                 
-                # Añadir ruta de audio a la descripción y a la lista
-                desc["audio_file"] = str(audio_file)
-                audio_files.append(audio_path)
+                for i, future in enumerate(futures):
+                    progress = int(50 + (i / len(descriptions)) * 40)  # Progreso entre 50% y 90%
+                    self.processing_status[video_id].update({
+                        "progress": progress,
+                        "current_step": f"Generando audio {i+1} de {len(descriptions)}"
+                    })
+                    future.result()
             
             # Actualizar el archivo JSON con las rutas de audio
             with open(desc_file, 'w', encoding='utf-8') as f:
@@ -150,6 +237,7 @@ class AudioProcessor:
                     
                     command = [
                         'ffmpeg',
+                        '-v', 'error', '-nostats',  # Solo errores en stderr, que se guarda entero en memoria
                         *audio_inputs,
                         '-filter_complex', filter_complex,
                         '-y',  # Sobrescribir si existe
@@ -165,7 +253,6 @@ class AudioProcessor:
                     # Si hay error al combinar, usamos el primer archivo como audio principal
                     if audio_files:
                         try:
-                            import shutil
                             shutil.copy2(str(audio_files[0]), str(combined_audio_path))
                             logging.info(f"Usando primer audio como principal: {combined_audio_path}")
                         except Exception as e2:
@@ -186,6 +273,11 @@ class AudioProcessor:
             
         except Exception as e:
             logging.error(f"Error generating audio description: {str(e)}")
+            # Cerrar el generador espera a que termine la lectura adelantada
+            # antes de liberar la captura que está usando
+            if frames is not None:
+                frames.close()
+            self.video_analyzer.close(video_path)
             self.processing_status[video_id] = {
                 "status": "error",
                 "progress": 0,
@@ -193,6 +285,60 @@ class AudioProcessor:
             }
             raise
     
+    def _find_cached_description(self, cache: OrderedDict, frame_hash: int):
+        """Busca una descripción ya pedida para un fotograma casi idéntico"""
+        for cached_hash, description in reversed(cache.items()):
+            if self.video_analyzer.hash_distance(frame_hash, cached_hash) <= self.DUPLICATE_FRAME_DISTANCE:
+                cache.move_to_end(cached_hash)
+                return description
+        return None
+
+    def _synthesize_speech(self, text: str, lang: str, audio_path: Path) -> None:
+        """Genera con gTTS el MP3 de un texto, reutilizando el de la caché si ya existe"""
+        if self.tts_cache_dir is None:
+            gTTS(text=text, lang=lang).save(str(audio_path))
+            return
+        
+        key = hashlib.sha256(f"{lang}|{text}".encode("utf-8")).hexdigest()
+        cached_path = self.tts_cache_dir / f"{self.TTS_CACHE_VERSION}-{key}.mp3"
+        try:
+            shutil.copyfile(cached_path, audio_path)
+            # La fecha de modificación marca el último uso para la limpieza
+            os.utime(cached_path)
+            logging.debug(f"Reusing cached speech for: {text[:40]}")
+            return
+        except FileNotFoundError:
+            pass
+        
+        self.tts_cache_dir.mkdir(parents=True, exist_ok=True)
+        # Se escribe en un temporal y se renombra: la caché nunca contiene un MP3 a medias
+        fd, tmp_path = tempfile.mkstemp(dir=self.tts_cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            gTTS(text=text, lang=lang).save(tmp_path)
+            shutil.copyfile(tmp_path, audio_path)
+            os.replace(tmp_path, cached_path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+        self._prune_tts_cache()
+
+    def _prune_tts_cache(self) -> None:
+        """Borra los audios usados hace más tiempo hasta dejar la caché bajo TTS_CACHE_MAX_BYTES"""
+        entries = []
+        for path in self.tts_cache_dir.glob("*.mp3"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.TTS_CACHE_MAX_BYTES:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
     async def get_audiodescription(self, video_id: str):
         """Obtiene los datos de audiodescripción generados"""
         try:
@@ -283,9 +429,7 @@ class AudioProcessor:
             audio_file = f"{video_id}_desc_{desc_id}.mp3"
             audio_path = audio_dir / audio_file
             
-            # Usar gTTS para generar audio
-            tts = gTTS(text=target_desc["text"], lang=voice_type[:2])
-            tts.save(str(audio_path))
+            self._synthesize_speech(target_desc["text"], voice_type[:2], audio_path)
             
             # Actualizar ruta de audio si es necesario
             if "audio_file" not in target_desc:
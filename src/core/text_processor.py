@@ -1,19 +1,79 @@
 import cv2
 import os
 import google.generativeai as genai
+import numpy as np
 from PIL import Image
 import json
+import hashlib
+import sqlite3
+import threading
 from pathlib import Path
+from typing import Optional, Union
 import logging
 from ..utils.formatters import format_timecode
 
+# Codificador JPEG por GPU (nvJPEG) opcional; sin CUDA se usa cv2.imencode.
+# Se crea en la primera codificación para no abrir un contexto CUDA al importar
+_nvjpeg = None
+_nvjpeg_checked = False
+_nvjpeg_lock = threading.Lock()
+
+
+def _get_nvjpeg():
+    """Devuelve el codificador nvJPEG, o None si no está disponible"""
+    global _nvjpeg, _nvjpeg_checked
+    with _nvjpeg_lock:
+        if not _nvjpeg_checked:
+            _nvjpeg_checked = True
+            try:
+                from nvjpeg import NvJpeg
+                _nvjpeg = NvJpeg()
+            except Exception:
+                logging.debug("nvJPEG no disponible, la codificación JPEG se hará en CPU")
+        return _nvjpeg
+
+# Modelos de Gemini compartidos por todos los TextProcessor del proceso
+_vision_models = {}
+_vision_lock = threading.Lock()
+
+
+def _load_vision_model(api_key: str, name: str):
+    """Configura la API y crea el modelo una sola vez por proceso"""
+    with _vision_lock:
+        model = _vision_models.get((api_key, name))
+        if model is None:
+            genai.configure(api_key=api_key)
+            model = genai.GenerativeModel(name)
+            _vision_models[(api_key, name)] = model
+        return model
+
+class _DescriptionCache:
+    """Conexión SQLite a la caché de descripciones, compartida por todos los TextProcessor del proceso"""
+    __slots__ = ("conn", "lock", "inserts")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        # Una sola conexión usada desde varios hilos: todo acceso pasa por este lock
+        self.lock = threading.Lock()
+        self.inserts = 0
+
+_caches = {}
+_caches_lock = threading.Lock()
+
 class TextProcessor:
+    # Subir la versión al cambiar el prompt o el modelo invalida la caché
+    CACHE_VERSION = "v1"
+    # Número máximo de descripciones guardadas; al superarlo se borran las insertadas hace más tiempo
+    CACHE_MAX_ENTRIES = 50000
+    # La limpieza se hace cada tantas inserciones, así que la caché puede pasarse del máximo por poco
+    CACHE_PRUNE_EVERY = 256
+
     def __init__(self, settings):
         self.settings = settings
+        self._cache = self._open_cache(settings)
         try:
             if hasattr(settings, 'GOOGLE_AI_STUDIO_API_KEY') and settings.GOOGLE_AI_STUDIO_API_KEY:
-                genai.configure(api_key=settings.GOOGLE_AI_STUDIO_API_KEY)
-                self.vision_model = genai.GenerativeModel('gemini-1.5-flash')
+                self.vision_model = _load_vision_model(settings.GOOGLE_AI_STUDIO_API_KEY, 'gemini-1.5-flash')
                 logging.info("Google AI Studio API configurada correctamente")
             else:
                 logging.warning("API key de Google AI Studio no configurada")
@@ -22,7 +82,7 @@ class TextProcessor:
             logging.error(f"Error configurando Google AI Studio: {e}")
             self.vision_model = None
         
-    def generate_description(self, image: Image.Image, max_duration_ms: int) -> str:
+    def generate_description(self, image: Union[Image.Image, np.ndarray, str, Path], max_duration_ms: int) -> str:
         try:
             if image is None:
                 return "En esta escena no se detectó contenido visual."
@@ -47,10 +107,17 @@ class TextProcessor:
                 - No uses metáforas"""
 
             try:
-                response = self.vision_model.generate_content([prompt, image])
-                
-                if response and response.text:
-                    description = response.text.strip()
+                image_part = self._to_image_part(image)
+                cache_key = self._cache_key(image_part)
+                description = self._cache_get(cache_key)
+
+                if description is None:
+                    response = self.vision_model.generate_content([prompt, image_part])
+                    if response and response.text:
+                        description = response.text.strip()
+                        self._cache_set(cache_key, description)
+
+                if description:
                     words = description.split()
                     max_words = int((max_duration_ms / 1000) * 3)
 
@@ -68,6 +135,121 @@ class TextProcessor:
             logging.error(f"Error generating description: {str(e)}")
             return "En esta escena continúa la narrativa del video."
             
+    @classmethod
+    def _open_cache(cls, settings) -> Optional[_DescriptionCache]:
+        """Abre la caché en disco de respuestas de Gemini (SQLite), una vez por proceso y archivo"""
+        data_dir = getattr(settings, "DATA_DIR", None)
+        if data_dir is None:
+            return None
+        cache_path = (Path(data_dir) / "cache" / "vision.sqlite").resolve()
+        with _caches_lock:
+            cache = _caches.get(cache_path)
+            if cache is not None:
+                return cache
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(cache_path, timeout=30, check_same_thread=False)
+                conn.execute("CREATE TABLE IF NOT EXISTS descriptions (key TEXT PRIMARY KEY, text TEXT NOT NULL)")
+                conn.commit()
+            except Exception as e:
+                logging.warning(f"No se pudo abrir la caché de descripciones: {e}")
+                return None
+            cache = _caches[cache_path] = _DescriptionCache(conn)
+        # Otros procesos pueden haberla llenado: se recorta al abrirla
+        with cache.lock:
+            try:
+                cls._prune_cache(cache.conn)
+                cache.conn.commit()
+            except sqlite3.Error as e:
+                logging.warning(f"No se pudo limpiar la caché de descripciones: {e}")
+        return cache
+
+    @classmethod
+    def _prune_cache(cls, conn: sqlite3.Connection) -> None:
+        """Borra las entradas más antiguas que excedan CACHE_MAX_ENTRIES"""
+        # INSERT OR REPLACE asigna un rowid nuevo, así que el rowid más bajo es la entrada más antigua
+        conn.execute(
+            "DELETE FROM descriptions WHERE rowid IN (SELECT rowid FROM descriptions ORDER BY rowid "
+            "LIMIT max(0, (SELECT COUNT(*) FROM descriptions) - ?))",
+            (cls.CACHE_MAX_ENTRIES,))
+
+    @classmethod
+    def _cache_key(cls, image_part) -> str:
+        """Clave de caché a partir del contenido de la imagen"""
+        if isinstance(image_part, dict):
+            content = image_part["data"]
+        else:
+            content = f"{image_part.mode}{image_part.size}".encode() + image_part.tobytes()
+        return f"{cls.CACHE_VERSION}-gemini:{hashlib.sha256(content).hexdigest()}"
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        if self._cache is None:
+            return None
+        # Un fallo de la caché cuenta como fallo de búsqueda, nunca como error de la descripción
+        try:
+            with self._cache.lock:
+                row = self._cache.conn.execute("SELECT text FROM descriptions WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logging.warning(f"No se pudo leer la caché de descripciones: {e}")
+            return None
+        return row[0] if row else None
+
+    def _cache_set(self, key: str, text: str) -> None:
+        if self._cache is None:
+            return
+        try:
+            with self._cache.lock:
+                conn = self._cache.conn
+                conn.execute("INSERT OR REPLACE INTO descriptions (key, text) VALUES (?, ?)", (key, text))
+                self._cache.inserts += 1
+                if self._cache.inserts % self.CACHE_PRUNE_EVERY == 0:
+                    self._prune_cache(conn)
+                conn.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"No se pudo guardar la descripción en caché: {e}")
+            try:
+                with self._cache.lock:
+                    self._cache.conn.rollback()
+            except sqlite3.Error:
+                pass
+
+    @classmethod
+    def _to_image_part(cls, image: Union[Image.Image, np.ndarray, str, Path]):
+        """Prepara la imagen para Gemini.
+
+        Los fotogramas de OpenCV se envían ya codificados en JPEG para que
+        el SDK no tenga que convertirlos a PIL y recodificarlos en PNG.
+        """
+        if isinstance(image, np.ndarray):
+            return {"mime_type": "image/jpeg", "data": cls._encode_jpeg(image)}
+        return cls._to_pil_image(image)
+
+    @staticmethod
+    def _encode_jpeg(frame: np.ndarray, quality: int = 90) -> bytes:
+        """Codifica un fotograma BGR en JPEG, con nvJPEG si hay GPU"""
+        encoder = _get_nvjpeg()
+        if encoder is not None:
+            try:
+                return encoder.encode(np.ascontiguousarray(frame), quality)
+            except Exception as e:
+                logging.warning(f"Error codificando con nvJPEG, se usa CPU: {e}")
+        ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ok:
+            raise ValueError("No se pudo codificar el fotograma en JPEG")
+        return buffer.tobytes()
+
+    @staticmethod
+    def _to_pil_image(image: Union[Image.Image, np.ndarray, str, Path]) -> Image.Image:
+        """Normaliza la entrada a una imagen PIL sin pasar por disco.
+
+        Los ``np.ndarray`` se asumen en BGR, tal como los devuelve OpenCV.
+        """
+        if isinstance(image, Image.Image):
+            return image
+        if isinstance(image, np.ndarray):
+            return Image.fromarray(np.ascontiguousarray(image[..., ::-1]))
+        return Image.open(image)
+
     def save_script(self, descriptions: list) -> Path:
         try:
             script = [{
@@ -118,21 +300,25 @@ class TextProcessor:
             timestamps = list(range(0, int(duration), interval))
             script = []
 
-            for timestamp in timestamps:
-                # Extract frame at timestamp
-                frame = self.video_analyzer.extract_frame(video_path, timestamp * 1000)
-                
-                if frame:
-                    # Generate description for the frame
-                    description = self.generate_description(frame, interval * 1000)
+            try:
+                for timestamp in timestamps:
+                    # Extract frame at timestamp
+                    frame = self.video_analyzer.extract_frame(video_path, timestamp * 1000)
                     
-                    if description:
-                        timecode = format_timecode(timestamp)
-                        script_entry = {
-                            "timecode": timecode,
-                            "text": description
-                        }
-                        script.append(script_entry)
+                    if frame:
+                        # Generate description for the frame
+                        description = self.generate_description(frame, interval * 1000)
+                        
+                        if description:
+                            timecode = format_timecode(timestamp)
+                            script_entry = {
+                                "timecode": timecode,
+                                "text": description
+                            }
+                            script.append(script_entry)
+            finally:
+                # extract_frame deja la captura abierta para las siguientes llamadas
+                self.video_analyzer.close(video_path)
 
             output_path = self.settings.TRANSCRIPTS_DIR / f"{video_path.stem}_script.json"
             self.save_formatted_script(script, output_path)
@@ -1,7 +1,8 @@
 # src/models/database_models.py
 import uuid
 from datetime import datetime
-from src.config.database import execute_query
+from psycopg2.extras import execute_values
+from src.config.database import execute_query, get_conn
 
 class Video:
     @staticmethod
@@ -46,6 +47,30 @@ class Frame:
         result = execute_query(query, (video_id, frame_number, timestamp, path, description))
         return result[0]['id'] if result else None
 
+    @staticmethod
+    def bulk_create(video_id, frames):
+        """Crea varios frames en una sola sentencia y devuelve una lista de pares (frame_number, id).
+
+        Los pares no siguen el orden de ``frames``: RETURNING no garantiza ningún orden,
+        así que cada ID debe emparejarse con su frame por frame_number, no por posición.
+        """
+        with get_conn() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    rows = execute_values(
+                        cursor,
+                        "INSERT INTO frames (video_id, frame_number, timestamp, path, description) VALUES %s RETURNING frame_number, id",
+                        [(video_id, frame['frame_number'], frame['timestamp'], frame['path'], frame.get('description'))
+                         for frame in frames],
+                        page_size=1000,
+                        fetch=True
+                    )
+                    conn.commit()
+                    return [(row[0], row[1]) for row in rows]
+            except Exception:
+                conn.rollback()
+                raise
+
     @staticmethod
     def get_by_video_id(video_id):
         """Obtiene todos los frames de un video."""
@@ -79,20 +104,21 @@ class Subtitle:
     @staticmethod
     def bulk_insert(video_id, subtitles, language='es'):
         """Inserta múltiples subtítulos a la vez."""
-        conn = get_connection()
-        try:
-            with conn.cursor() as cursor:
-                for subtitle in subtitles:
-                    cursor.execute(
-                        "INSERT INTO subtitles (video_id, start_time, end_time, text, language) VALUES (%s, %s, %s, %s, %s)",
-                        (video_id, subtitle['start_time'], subtitle['end_time'], subtitle['text'], language)
+        with get_conn() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    # Una sola sentencia por página en lugar de un INSERT por subtítulo
+                    execute_values(
+                        cursor,
+                        "INSERT INTO subtitles (video_id, start_time, end_time, text, language) VALUES %s",
+                        [(video_id, subtitle['start_time'], subtitle['end_time'], subtitle['text'], language)
+                         for subtitle in subtitles],
+                        page_size=500
                     )
-                conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+                    conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise
 
 class AudioDescription:
     @staticmethod
@@ -1,14 +1,49 @@
+from bisect import bisect_left
+import weakref
 from typing import List, Dict, Optional
-from pydantic import BaseModel
 
-class Scene(BaseModel):
+class Scene:
     """Modelo que representa una escena o segmento de video"""
-    id: str
-    start_time: int  # Tiempo de inicio en milisegundos
-    end_time: int    # Tiempo de fin en milisegundos
-    frame_path: Optional[str] = None  # Ruta a un frame representativo de la escena
-    description: Optional[str] = None  # Descripción generada de la escena
-    confidence: Optional[float] = None  # Confianza de la detección/descripción
+    # Sin __dict__ por instancia: un video largo puede tener miles de escenas
+    __slots__ = ("id", "start_time", "end_time", "frame_path", "description", "confidence", "_indexed_by")
+    _FIELDS = ("id", "start_time", "end_time", "frame_path", "description", "confidence")
+    
+    def __init__(self, id: str, start_time: int, end_time: int,
+                 frame_path: Optional[str] = None, description: Optional[str] = None,
+                 confidence: Optional[float] = None):
+        # Listas de SceneCollection cuyo índice incluye esta escena (referencias débiles)
+        self._indexed_by = None
+        self.id = id
+        self.start_time = start_time  # Tiempo de inicio en milisegundos
+        self.end_time = end_time      # Tiempo de fin en milisegundos
+        self.frame_path = frame_path  # Ruta a un frame representativo de la escena
+        self.description = description  # Descripción generada de la escena
+        self.confidence = confidence  # Confianza de la detección/descripción
+    
+    def __setattr__(self, name, value) -> None:
+        object.__setattr__(self, name, value)
+        # Cambiar el inicio invalida solo los índices de las colecciones que contienen la escena
+        if name == "start_time" and self._indexed_by:
+            for ref in self._indexed_by:
+                scenes = ref()
+                if scenes is not None:
+                    scenes.version += 1
+    
+    def _watch(self, scenes: '_SceneList') -> None:
+        """Registrar una lista cuyo índice depende del start_time de esta escena"""
+        if self._indexed_by is None:
+            self._indexed_by = [weakref.ref(scenes)]
+        elif not any(ref() is scenes for ref in self._indexed_by):
+            self._indexed_by = [ref for ref in self._indexed_by if ref() is not None]
+            self._indexed_by.append(weakref.ref(scenes))
+    
+    def __repr__(self) -> str:
+        return f"Scene(id={self.id!r}, start_time={self.start_time}, end_time={self.end_time})"
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Scene):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._FIELDS)
     
     def duration_ms(self) -> int:
         """Obtener la duración de la escena en milisegundos"""
@@ -29,22 +64,82 @@ class Scene(BaseModel):
     @classmethod
     def from_dict(cls, data: Dict) -> 'Scene':
         """Crear escena desde diccionario"""
-        return cls(**data)
+        # to_dict añade duration_ms, que es derivado y no se almacena
+        return cls(**{key: value for key, value in data.items() if key != "duration_ms"})
+
+class _SceneList(list):
+    """Lista de escenas que cuenta sus modificaciones y las de start_time de sus escenas indexadas"""
+    __slots__ = ("version", "__weakref__")
+    
+    def __init__(self, scenes=()):
+        super().__init__(scenes)
+        self.version = 0
 
-class SceneCollection(BaseModel):
+def _counts_mutation(name):
+    method = getattr(list, name)
+    
+    def mutator(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+    
+    mutator.__name__ = name
+    return mutator
+
+for _name in ("__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend",
+              "insert", "pop", "remove", "clear", "sort", "reverse"):
+    setattr(_SceneList, _name, _counts_mutation(_name))
+
+class SceneCollection:
     """Colección de escenas de un video"""
-    video_id: str
-    scenes: List[Scene] = []
+    __slots__ = ("video_id", "_scenes", "_sorted", "_starts", "_index_key")
+    
+    def __init__(self, video_id: str, scenes: Optional[List[Scene]] = None):
+        self.video_id = video_id
+        self.scenes = scenes or []
+    
+    @property
+    def scenes(self) -> List[Scene]:
+        return self._scenes
+    
+    @scenes.setter
+    def scenes(self, scenes: List[Scene]) -> None:
+        self._scenes = _SceneList(scenes)
+        # Índice para búsqueda binaria: escenas ordenadas por inicio y sus tiempos de inicio,
+        # válido mientras no cambie la versión de la lista
+        self._sorted: List[Scene] = []
+        self._starts: List[int] = []
+        self._index_key = None
     
     def add_scene(self, scene: Scene) -> None:
         """Añadir una escena a la colección"""
-        self.scenes.append(scene)
+        index_is_current = self._index_key == self._scenes.version
+        self._scenes.append(scene)
+        # Caso habitual: las escenas llegan en orden y el índice se amplía sin reconstruirlo
+        if index_is_current and (not self._starts or scene.start_time >= self._starts[-1]):
+            scene._watch(self._scenes)
+            self._sorted.append(scene)
+            self._starts.append(scene.start_time)
+            self._index_key = self._scenes.version
+    
+    def _scene_index(self) -> List[int]:
+        """Devolver los inicios ordenados, reconstruyendo el índice si las escenas cambiaron"""
+        if self._index_key != self._scenes.version:
+            for scene in self._scenes:
+                scene._watch(self._scenes)
+            self._sorted = sorted(self._scenes, key=lambda scene: scene.start_time)
+            self._starts = [scene.start_time for scene in self._sorted]
+            self._index_key = self._scenes.version
+        return self._starts
     
     def get_scene_at_time(self, timestamp_ms: int) -> Optional[Scene]:
         """Obtener la escena en un timestamp específico"""
-        for scene in self.scenes:
-            if scene.start_time <= timestamp_ms <= scene.end_time:
-                return scene
+        starts = self._scene_index()
+        i = bisect_left(starts, timestamp_ms)
+        # En un límite compartido gana la escena que termina ahí, como en el recorrido lineal
+        if i > 0 and self._sorted[i - 1].end_time >= timestamp_ms:
+            return self._sorted[i - 1]
+        if i < len(starts) and starts[i] == timestamp_ms:
+            return self._sorted[i]
         return None
     
     def to_dict(self) -> Dict:
@@ -1,8 +1,22 @@
 from typing import List, Dict
 import json
+import re
 from datetime import timedelta
 
+# HH:MM:SS,mmm (SRT) or HH:MM:SS.mmm (VTT); short fractions like "01,5" are tenths
+_TIMESTAMP_RE = re.compile(r"(\d+):(\d{1,2}):(\d{1,2})(?:[,.](\d{1,3}))?")
+# One SRT cue: index line, "start --> end" line, then text up to the next blank line.
+# Expects "\n" line endings; from_srt normalises CRLF and drops a BOM first
+_SRT_CUE_RE = re.compile(
+    r"^\d+[^\S\n]*\n"
+    r"(\d+:\d{1,2}:\d{1,2}(?:[,.]\d{1,3})?) --> (\d+:\d{1,2}:\d{1,2}(?:[,.]\d{1,3})?)[^\n]*\n"
+    r"([^\n].*?)(?=\n\n|\n*\Z)",
+    re.S | re.M
+)
+
 class Transcript:
+    __slots__ = ("segments", "_next_id", "_max_end", "_word_count")
+
     def __init__(self, segments: List[Dict] = None):
         """
         Initialize a transcript with optional segments.
@@ -13,12 +27,22 @@ class Transcript:
         - text: transcript text
         """
         self.segments = segments or []
+        self._load_stats()
+
+    def _load_stats(self) -> None:
+        """Recompute the bookkeeping kept alongside self.segments"""
+        self._next_id = len(self.segments) + 1
+        self._max_end = max((segment["end"] for segment in self.segments), default=0)
+        self._word_count = sum(len(segment["text"].split()) for segment in self.segments)
 
     def add_segment(self, start: int, end: int, text: str) -> None:
         """Add a new segment to the transcript"""
-        segment_id = str(len(self.segments) + 1)
+        segment_id = self._next_id
+        self._next_id += 1
+        self._max_end = max(self._max_end, end)
+        self._word_count += len(text.split())
         self.segments.append({
-            "id": segment_id,
+            "id": str(segment_id),
             "start": start,
             "end": end,
             "text": text
@@ -37,30 +61,29 @@ class Transcript:
         for segment in self.segments:
             if segment["id"] == segment_id:
                 if text is not None:
+                    self._word_count += len(text.split()) - len(segment["text"].split())
                     segment["text"] = text
                 if start is not None:
                     segment["start"] = start
                 if end is not None:
+                    old_end = segment["end"]
                     segment["end"] = end
+                    if end >= self._max_end:
+                        self._max_end = end
+                    elif old_end == self._max_end:
+                        # The longest segment got shorter: rescan for the new maximum
+                        self._max_end = max(s["end"] for s in self.segments)
                 return True
         return False
 
     def to_srt(self) -> str:
         """Convert transcript to SRT format"""
-        srt_parts = []
-        for i, segment in enumerate(self.segments, 1):
-            # Convert milliseconds to SRT timestamp format
-            start = self._ms_to_srt_timestamp(segment["start"])
-            end = self._ms_to_srt_timestamp(segment["end"])
-            
-            srt_parts.extend([
-                str(i),
-                f"{start} --> {end}",
-                segment["text"],
-                ""  # Empty line between entries
-            ])
-        
-        return "\n".join(srt_parts)
+        # One string per cue, joined once, instead of four list appends per cue
+        to_timestamp = self._ms_to_srt_timestamp
+        return "\n".join(
+            f"{i}\n{to_timestamp(segment['start'])} --> {to_timestamp(segment['end'])}\n{segment['text']}\n"
+            for i, segment in enumerate(self.segments, 1)
+        )
 
     def to_json(self) -> str:
         """Convert transcript to JSON format"""
@@ -72,64 +95,42 @@ class Transcript:
         """Load transcript from JSON string"""
         data = json.loads(json_str)
         self.segments = data.get("segments", [])
+        self._load_stats()
 
     def from_srt(self, srt_content: str) -> None:
         """Load transcript from SRT format"""
-        self.segments = []
-        blocks = srt_content.strip().split("\n\n")
-        
-        for block in blocks:
-            if not block.strip():
-                continue
-                
-            lines = block.split("\n")
-            if len(lines) < 3:
-                continue
-                
-            # Parse timestamps
-            timestamp_line = lines[1]
-            start_str, end_str = timestamp_line.split(" --> ")
-            
-            # Convert SRT timestamps to milliseconds
-            start_ms = self._srt_timestamp_to_ms(start_str)
-            end_ms = self._srt_timestamp_to_ms(end_str)
-            
-            # Join all remaining lines as the text
-            text = "\n".join(lines[2:])
-            
-            self.add_segment(start_ms, end_ms, text)
+        to_ms = self._srt_timestamp_to_ms
+        srt_content = srt_content.replace("\r\n", "\n").lstrip("\ufeff")
+        self.segments = [
+            {"id": str(i), "start": to_ms(start), "end": to_ms(end), "text": text}
+            for i, (start, end, text) in enumerate(_SRT_CUE_RE.findall(srt_content), 1)
+        ]
+        self._load_stats()
 
     def _ms_to_srt_timestamp(self, ms: int) -> str:
         """Convert milliseconds to SRT timestamp format"""
-        hours = ms // 3600000
-        ms = ms % 3600000
-        minutes = ms // 60000
-        ms = ms % 60000
-        seconds = ms // 1000
-        ms = ms % 1000
-        
+        hours, ms = divmod(ms, 3600000)
+        minutes, ms = divmod(ms, 60000)
+        seconds, ms = divmod(ms, 1000)
         return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
 
     def _srt_timestamp_to_ms(self, timestamp: str) -> int:
         """Convert SRT timestamp to milliseconds"""
-        timestamp = timestamp.replace(",", ".")
-        h, m, s = timestamp.split(":")
-        hours = int(h)
-        minutes = int(m)
-        seconds = float(s)
-        
-        total_ms = (hours * 3600 + minutes * 60 + seconds) * 1000
-        return int(total_ms)
+        # Integer arithmetic only: float seconds could round 1.001 s down to 1000 ms
+        match = _TIMESTAMP_RE.fullmatch(timestamp.strip())
+        if match is None:
+            raise ValueError(f"Invalid SRT timestamp: {timestamp!r}")
+        h, m, s, ms = match.groups()
+        # The fraction is decimal: "5" is 500 ms, "05" is 50 ms
+        return int(h) * 3600000 + int(m) * 60000 + int(s) * 1000 + int((ms or "0").ljust(3, "0"))
 
     def get_duration(self) -> int:
         """Get total duration in milliseconds"""
-        if not self.segments:
-            return 0
-        return max(segment["end"] for segment in self.segments)
+        return self._max_end
 
     def get_word_count(self) -> int:
         """Get total word count"""
-        return sum(len(segment["text"].split()) for segment in self.segments)
+        return self._word_count
 
     @property
     def is_empty(self) -> bool:
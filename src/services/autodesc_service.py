@@ -10,6 +10,7 @@ from ..core.text_processor import TextProcessor
 from ..core.audio_processor import AudioProcessor
 from ..core.speech_processor import SpeechProcessor
 from ..models.scene import Scene
+from ..utils.directory_utils import get_render_stamp_path
 
 class AudioDescService:
     def __init__(self, settings):
@@ -41,7 +42,11 @@ class AudioDescService:
             
             # Detectar intervalos de silencio
             self._update_status(video_id, "processing", "Detectando intervalos de silencio", 25)
-            silence_intervals = await self.speech_processor.detect_speech_silence(video_path)
+            try:
+                silence_intervals = await self.speech_processor.detect_speech_silence(video_path)
+            finally:
+                # El audio decodificado se libera también si la detección falla
+                self.speech_processor.close_audio(video_path)
             
             # Generar descripciones
             self._update_status(video_id, "processing", "Generando descripciones de escenas", 40)
@@ -120,12 +125,20 @@ class AudioDescService:
             # Ruta de salida
             output_path = self.processed_dir / f"{video_id}_with_audiodesc.mp4"
             
+            # ffmpeg escribe en un archivo temporal que solo se renombra al terminar bien,
+            # así un renderizado a medias nunca pasa por uno válido
+            partial_path = output_path.with_name(f"{output_path.stem}.partial.mp4")
+            
+            # Este renderizado no registra sus entradas: el video deja de contar como actualizado
+            get_render_stamp_path(output_path).unlink(missing_ok=True)
+            
             # Actualizar estado
             self._update_status(video_id, "processing", "Combinando video con audiodescripciones", 30)
             
             # Ejecutar FFmpeg para combinar
             command = [
                 'ffmpeg',
+                '-v', 'error', '-nostats',  # Solo errores en stderr, que se guarda entero en memoria
                 '-i', str(video_path),  # Video original
                 '-i', str(audio_path),  # Audio con audiodescripciones
                 '-map', '0:v',  # Usar el stream de video del primer input
@@ -135,7 +148,7 @@ class AudioDescService:
                 '-b:a', '192k',  # Bitrate de audio
                 '-shortest',  # Terminar cuando el stream más corto acabe
                 '-y',  # Sobrescribir archivo de salida si existe
-                str(output_path)
+                str(partial_path)
             ]
             
             # Ejecutar el comando
@@ -149,8 +162,10 @@ class AudioDescService:
             stdout, stderr = await process.communicate()
             
             if process.returncode != 0:
+                partial_path.unlink(missing_ok=True)
                 logging.error(f"Error en FFmpeg: {stderr.decode()}")
                 raise Exception(f"Error al renderizar video: {stderr.decode()}")
+            os.replace(partial_path, output_path)
             
             # Actualizar estado
             self._update_status(video_id, "completed", "Video con audiodescripciones generado correctamente", 100)
@@ -302,6 +317,7 @@ class AudioDescService:
             output_video = self.processed_dir / f"{video_id}_with_audiodesc.mp4"
             if output_video.exists():
                 output_video.unlink()
+            get_render_stamp_path(output_video).unlink(missing_ok=True)
             
             # Eliminar estado
             self._processing_status.pop(video_id, None)
@@ -25,7 +25,11 @@ class SubtitleService:
                 "current_step": "Transcribiendo audio"
             }
             
-            transcript = await self.speech_processor.transcribe_video(video_path)
+            try:
+                transcript = await self.speech_processor.transcribe_video(video_path)
+            finally:
+                # El audio decodificado se libera también si la transcripción falla
+                self.speech_processor.close_audio(video_path)
             
             self._processing_status[video_id].update({
                 "progress": 70,
@@ -225,20 +229,12 @@ class SubtitleService:
     
     def _segments_to_srt(self, segments: List[Dict]) -> str:
         """Convertir segmentos a formato SRT"""
-        srt_lines = []
-        
-        for segment in segments:
-            # Formatear tiempos
-            start_time = self._format_time(segment["start"])
-            end_time = self._format_time(segment["end"])
-            
-            # Añadir bloque
-            srt_lines.append(segment["id"])
-            srt_lines.append(f"{start_time} --> {end_time}")
-            srt_lines.append(segment["text"])
-            srt_lines.append("")  # Línea vacía entre bloques
-        
-        return "\n".join(srt_lines)
+        # Un único string por bloque y un solo join, con una línea vacía entre bloques
+        format_time = self._format_time
+        return "\n".join(
+            f"{segment['id']}\n{format_time(segment['start'])} --> {format_time(segment['end'])}\n{segment['text']}\n"
+            for segment in segments
+        )
     
     def _format_time(self, ms: int) -> str:
         """Convertir milisegundos a formato de tiempo SRT (HH:MM:SS,mmm)"""
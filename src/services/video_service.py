@@ -15,6 +15,7 @@ from ..core.speech_processor import SpeechProcessor
 from ..core.audio_processor import AudioProcessor
 from ..models.scene import Scene
 from ..utils.validators import validate_video_file
+from ..utils.directory_utils import get_render_stamp_path, get_file_signature
 
 class VideoService:
     def __init__(self, settings):
@@ -46,8 +47,8 @@ class VideoService:
             # Save video file
             video_path = video_dir / file.filename
             content = await file.read()
-            with open(video_path, "wb") as f:
-                f.write(content)
+            async with aiofiles.open(video_path, "wb") as f:
+                await f.write(content)
                 
             # Initialize processing status
             self._processing_status[video_id] = {
@@ -82,17 +83,17 @@ class VideoService:
             if not first_chunk:
                 raise ValueError("El archivo subido está vacío")
             
-            # Guardar el archivo
-            with open(video_path, 'wb') as out_file:
+            # Guardar el archivo sin bloquear el event loop
+            async with aiofiles.open(video_path, 'wb') as out_file:
                 # Escribir el primer chunk que ya leímos
-                out_file.write(first_chunk)
+                await out_file.write(first_chunk)
                 
                 # Leer y escribir el resto del archivo
                 while True:
                     chunk = await file.read(1024 * 1024)  # Leer en chunks de 1MB
                     if not chunk:
                         break
-                    out_file.write(chunk)
+                    await out_file.write(chunk)
             
             # Verificar que el archivo se guardó correctamente
             if not video_path.exists() or video_path.stat().st_size == 0:
@@ -107,9 +108,10 @@ class VideoService:
                 str(video_path)
             ]
             
-            result = subprocess.run(probe_command, capture_output=True, text=True)
-            if result.returncode != 0:
-                logging.error(f"Error validando video: {result.stderr}")
+            try:
+                await self._run_command(probe_command)
+            except subprocess.CalledProcessError as e:
+                logging.error(f"Error validando video: {e.stderr}")
                 raise ValueError("El archivo subido no es un video válido")
             
             # Actualizar estado
@@ -148,19 +150,22 @@ class VideoService:
                 "error": None
             }
             
+            # Limitar la resolución: no tiene sentido descargar más píxeles de los que se analizan
+            max_height = getattr(self.settings, 'YOUTUBE_MAX_HEIGHT', 720)
+            
             # Usar yt-dlp con opciones más flexibles
             try:
                 command = [
                     'yt-dlp',
-                    '-f', 'best[ext=mp4]/best',  # Formato más flexible
+                    '-f', f'best[ext=mp4][height<={max_height}]/best[height<={max_height}]/best[ext=mp4]/best',
                     '-o', str(video_path),
                     '--no-playlist',
                     youtube_url
                 ]
                 
-                # Ejecutar comando
-                result = subprocess.run(command, check=True, capture_output=True, text=True)
-                logging.info(f"yt-dlp output: {result.stdout}")
+                # Ejecutar comando sin bloquear el bucle de eventos
+                stdout = await self._run_command(command)
+                logging.info(f"yt-dlp output: {stdout}")
                 
             except subprocess.CalledProcessError as e:
                 logging.error(f"Error en yt-dlp: {e.stderr if hasattr(e, 'stderr') else str(e)}")
@@ -169,12 +174,12 @@ class VideoService:
                 logging.info("Intentando descarga alternativa...")
                 alt_command = [
                     'yt-dlp',
-                    '-f', 'best',  # Sin restricciones de formato
+                    '-f', f'best[height<={max_height}]/best',  # Sin restricciones de contenedor
                     '-o', str(video_path),
                     '--no-playlist',
                     youtube_url
                 ]
-                subprocess.run(alt_command, check=True, capture_output=True)
+                await self._run_command(alt_command)
             
             if not video_path.exists() or video_path.stat().st_size == 0:
                 raise Exception(f"Error downloading video from {youtube_url}")
@@ -201,6 +206,7 @@ class VideoService:
 
     async def analyze_video(self, video_id: str, options: Dict = None) -> Dict:
         """Process video with specified options"""
+        video_path = None
         try:
             video_path = await self.get_video_path(video_id)
             if not video_path:
@@ -236,12 +242,18 @@ class VideoService:
                 )
                 results['subtitles'] = sub_result
 
+            # Both steps share the extracted audio; release it once they are done
+            self.speech_processor.close_audio(video_path)
+
             # Update final status
             self._update_status(video_id, "completed", "Processing completed", 100)
             
             return results
 
         except Exception as e:
+            # Only drop this video's audio; other jobs may still be using theirs
+            if video_path:
+                self.speech_processor.close_audio(video_path)
             self._update_status(video_id, "error", str(e))
             logging.error(f"Error processing video: {str(e)}")
             raise
@@ -377,45 +389,9 @@ class VideoService:
         try:
             # Buscar y eliminar archivos del video
             video_path = await self.get_video_path(video_id)
-            if video_path and video_path.exists():
-                video_path.unlink()
-            
-            # Eliminar directorio del video si existe
-            video_dir = self.video_dir / video_id
-            if video_dir.exists():
-                # Eliminar todos los archivos dentro del directorio
-                for file in video_dir.glob("*"):
-                    file.unlink()
-                # Eliminar el directorio vacío
-                try:
-                    video_dir.rmdir()
-                except:
-                    pass
-            
-            # Eliminar archivos de subtítulos
-            subtitles_dir = Path("data/transcripts")
-            if subtitles_dir.exists():
-                subtitle_files = list(subtitles_dir.glob(f"{video_id}*.*"))
-                for file in subtitle_files:
-                    file.unlink()
-            
-            # Eliminar archivos de audio
-            audio_dir = Path("data/audio")
-            if audio_dir.exists():
-                audio_files = list(audio_dir.glob(f"{video_id}*.*"))
-                for file in audio_files:
-                    file.unlink()
-            
-            # Eliminar datos procesados
-            processed_dir = Path("data/processed") / video_id
-            if processed_dir.exists():
-                import shutil
-                shutil.rmtree(processed_dir)
-            
-            # Eliminar videos procesados con audiodescripciones integradas
-            integrated_video = Path(f"data/processed/{video_id}_with_audiodesc.mp4")
-            if integrated_video.exists():
-                integrated_video.unlink()
+
+            # El borrado de archivos se hace en un hilo para no bloquear el event loop
+            await asyncio.to_thread(self._delete_video_files, video_id, video_path)
             
             # Clean up processing status
             self._processing_status.pop(video_id, None)
@@ -425,7 +401,65 @@ class VideoService:
         except Exception as e:
             logging.error(f"Error deleting video: {str(e)}")
             return False
-            
+
+    def _delete_video_files(self, video_id: str, video_path: Optional[Path]) -> None:
+        """Elimina del disco todos los archivos asociados a un video"""
+        if video_path and video_path.exists():
+            video_path.unlink()
+        
+        # Eliminar directorio del video si existe
+        video_dir = self.video_dir / video_id
+        if video_dir.exists():
+            # Eliminar todos los archivos dentro del directorio
+            for file in video_dir.glob("*"):
+                file.unlink()
+            # Eliminar el directorio vacío
+            try:
+                video_dir.rmdir()
+            except:
+                pass
+        
+        # Eliminar archivos de subtítulos
+        subtitles_dir = Path("data/transcripts")
+        if subtitles_dir.exists():
+            subtitle_files = list(subtitles_dir.glob(f"{video_id}*.*"))
+            for file in subtitle_files:
+                file.unlink()
+        
+        # Eliminar archivos de audio
+        audio_dir = Path("data/audio")
+        if audio_dir.exists():
+            audio_files = list(audio_dir.glob(f"{video_id}*.*"))
+            for file in audio_files:
+                file.unlink()
+        
+        # Eliminar datos procesados
+        processed_dir = Path("data/processed") / video_id
+        if processed_dir.exists():
+            import shutil
+            shutil.rmtree(processed_dir)
+        
+        # Eliminar videos procesados con audiodescripciones integradas
+        integrated_video = Path(f"data/processed/{video_id}_with_audiodesc.mp4")
+        if integrated_video.exists():
+            integrated_video.unlink()
+        get_render_stamp_path(integrated_video).unlink(missing_ok=True)
+            
+    async def _run_command(self, command: List[str]) -> str:
+        """Ejecuta un comando en un subproceso asíncrono y devuelve su salida estándar"""
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(
+                process.returncode, command,
+                output=stdout.decode(errors='replace'), stderr=stderr.decode(errors='replace')
+            )
+        return stdout.decode(errors='replace')
+
     def _get_extension(self, filename: str) -> str:
         """Extrae la extensión de un nombre de archivo"""
         if not filename:
@@ -458,6 +492,24 @@ class VideoService:
             # Ruta del video de salida
             output_path = output_dir / f"{video_id}_with_audiodesc.mp4"
             
+            # Si el video se renderizó con estas mismas entradas, no hay nada que rehacer
+            stamp_path = get_render_stamp_path(output_path)
+            inputs = {"video": get_file_signature(video_path), "audio": get_file_signature(audio_path)}
+            if output_path.exists() and stamp_path.exists():
+                try:
+                    with open(stamp_path, 'r', encoding='utf-8') as f:
+                        if json.load(f) == inputs:
+                            logging.info(f"Reusing rendered video {output_path}")
+                            self._update_status(video_id, "completed", "Video con audiodescripciones generado correctamente", 100)
+                            return True
+                except (OSError, ValueError):
+                    pass
+            stamp_path.unlink(missing_ok=True)
+            
+            # ffmpeg escribe en un archivo temporal que solo se renombra al terminar bien,
+            # así un renderizado a medias nunca pasa por uno válido
+            partial_path = output_path.with_name(f"{output_path.stem}.partial.mp4")
+            
             # Actualizar estado
             self._update_status(video_id, "processing", "Combinando video con audiodescripciones", 20)
             
@@ -466,6 +518,7 @@ class VideoService:
                 # Comando FFmpeg para combinar video con audio
                 command = [
                     'ffmpeg',
+                    '-v', 'error', '-nostats',  # Solo errores en stderr, que se guarda entero en memoria
                     '-i', str(video_path),  # Video original
                     '-i', str(audio_path),  # Audio con audiodescripciones
                     '-map', '0:v',  # Usar el stream de video del primer input
@@ -475,19 +528,23 @@ class VideoService:
                     '-b:a', '192k',  # Bitrate de audio
                     '-shortest',  # Terminar cuando el stream más corto acabe
                     '-y',  # Sobrescribir archivo de salida si existe
-                    str(output_path)
+                    str(partial_path)
                 ]
                 
-                # Ejecutar comando
-                result = subprocess.run(command, capture_output=True, text=True)
-                
-                if result.returncode != 0:
-                    logging.error(f"Error en FFmpeg: {result.stderr}")
-                    raise Exception(f"Error al renderizar video: {result.stderr}")
+                # Ejecutar comando sin bloquear el bucle de eventos
+                try:
+                    await self._run_command(command)
+                except subprocess.CalledProcessError as e:
+                    partial_path.unlink(missing_ok=True)
+                    logging.error(f"Error en FFmpeg: {e.stderr}")
+                    raise Exception(f"Error al renderizar video: {e.stderr}")
                 
                 # Verificar que el archivo de salida existe
-                if not output_path.exists():
+                if not partial_path.exists():
                     raise Exception("El archivo de salida no se generó correctamente")
+                os.replace(partial_path, output_path)
+                with open(stamp_path, 'w', encoding='utf-8') as f:
+                    json.dump(inputs, f)
                 
                 # Actualizar estado
                 self._update_status(video_id, "completed", "Video con audiodescripciones generado correctamente", 100)
@@ -1,6 +1,7 @@
 from pathlib import Path
 import logging
 import json
+import os
 import shutil
 from typing import Dict, List, Any, Optional
 
@@ -188,7 +189,25 @@ def copy_video_to_raw(source_path: str, video_id: str) -> Path:
     dest_dir.mkdir(parents=True, exist_ok=True)
     
     dest_path = dest_dir / f"{video_id}.mp4"
-    shutil.copy2(source_path, dest_path)
+    # El video ya está en su sitio: no hay nada que copiar
+    if dest_path.exists() and os.path.samefile(source_path, dest_path):
+        return dest_path
+    
+    # Se enlaza o copia a un nombre temporal y se renombra encima del destino,
+    # así el destino anterior solo se sustituye cuando el nuevo está completo
+    tmp_path = dest_dir / f".{video_id}.mp4.tmp"
+    tmp_path.unlink(missing_ok=True)
+    try:
+        try:
+            # Un enlace duro evita copiar los datos cuando origen y destino
+            # están en el mismo volumen
+            os.link(source_path, tmp_path)
+        except OSError:
+            shutil.copy2(source_path, tmp_path)
+        os.replace(tmp_path, dest_path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
     
     return dest_path
 
@@ -203,4 +222,32 @@ def get_processed_video_path(video_id: str) -> Path:
         Path: Ruta al archivo de video procesado
     """
     root_dir = get_root_directory()
-    return root_dir / 'data' / 'processed' / f"{video_id}_with_audiodesc.mp4"
\ No newline at end of file
+    return root_dir / 'data' / 'processed' / f"{video_id}_with_audiodesc.mp4"
+def get_render_stamp_path(output_path: Path) -> Path:
+    """
+    Obtiene la ruta del archivo que registra con qué entradas se renderizó un video.
+    
+    Args:
+        output_path: Ruta del video renderizado
+        
+    Returns:
+        Path: Ruta del archivo JSON junto al video
+    """
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.inputs.json")
+
+def get_file_signature(path: Path) -> Dict[str, int]:
+    """
+    Obtiene tamaño, fecha de modificación e inodo de un archivo.
+    
+    Sirve para saber si una entrada cambió aunque conserve la fecha de
+    modificación del original, como ocurre con los enlaces duros y copy2.
+    
+    Args:
+        path: Ruta del archivo
+        
+    Returns:
+        Dict[str, int]: Firma del archivo
+    """
+    stat = Path(path).stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "inode": stat.st_ino}
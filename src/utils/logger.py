@@ -1,7 +1,14 @@
 import logging
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
 
 def setup_logging(base_dir: Path):
+    root = logging.getLogger()
+    # basicConfig ignores repeated calls, but the handlers below would still be
+    # created (and the log file opened) every time
+    if root.handlers:
+        return
+    
     log_dir = base_dir / 'logs'
     log_dir.mkdir(exist_ok=True)
     
@@ -9,7 +16,7 @@ def setup_logging(base_dir: Path):
         level=logging.INFO,
         format='%(asctime)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.FileHandler(log_dir / 'video_description.log'),
+            RotatingFileHandler(log_dir / 'video_description.log', maxBytes=50_000_000, backupCount=5),
             logging.StreamHandler()
         ]
-    )
\ No newline at end of file
+    )
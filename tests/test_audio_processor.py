@@ -0,0 +1,65 @@
+import os
+import asyncio
+from types import SimpleNamespace
+import pytest
+import src.core.audio_processor as audio_processor
+from src.core.audio_processor import AudioProcessor
+
+class FakeTTS:
+    """Stand-in for gTTS that records every synthesis request."""
+    calls = []
+
+    def __init__(self, text, lang):
+        self.text = text
+        self.lang = lang
+
+    def save(self, path):
+        FakeTTS.calls.append((self.text, self.lang))
+        with open(path, "wb") as f:
+            f.write(f"{self.lang}:{self.text}".encode())
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(audio_processor, "gTTS", FakeTTS)
+    FakeTTS.calls = []
+    return AudioProcessor(SimpleNamespace(DATA_DIR=tmp_path / "data"))
+
+def test_synthesize_speech_reuses_cached_audio(processor, tmp_path):
+    """The same text and language are synthesized only once."""
+    first, second = tmp_path / "a.mp3", tmp_path / "b.mp3"
+    processor._synthesize_speech("Una calle", "es", first)
+    processor._synthesize_speech("Una calle", "es", second)
+    processor._synthesize_speech("Una calle", "en", tmp_path / "c.mp3")
+    assert FakeTTS.calls == [("Una calle", "es"), ("Una calle", "en")]
+    assert first.read_bytes() == second.read_bytes() == b"es:Una calle"
+
+def test_tts_cache_evicts_least_recently_used(processor, tmp_path, monkeypatch):
+    """Once over its size cap the cache drops the entries used longest ago."""
+    monkeypatch.setattr(AudioProcessor, "TTS_CACHE_MAX_BYTES", 40)
+    processor._synthesize_speech("primera frase", "es", tmp_path / "a.mp3")
+    processor._synthesize_speech("segunda frase", "es", tmp_path / "b.mp3")
+    first, second = sorted(processor.tts_cache_dir.glob("*.mp3"), key=lambda p: p.stat().st_mtime)
+    os.utime(first, (0, 0))
+    processor._synthesize_speech("tercera frase", "es", tmp_path / "c.mp3")
+    cached = set(processor.tts_cache_dir.glob("*.mp3"))
+    assert first not in cached and second in cached and len(cached) == 2
+
+def test_video_locks_are_dropped_after_jobs(processor, monkeypatch):
+    """Jobs on the same video run one at a time and leave no lock behind."""
+    running = []
+
+    def fake_job(video_id, video_path, voice_type, save_frames):
+        running.append(video_id)
+        assert len(running) == 1
+        running.pop()
+        return video_id
+
+    monkeypatch.setattr(processor, "_generate_description", fake_job)
+
+    async def run_jobs():
+        return await asyncio.gather(processor.generate_description("a", "same.mp4"),
+                                    processor.generate_description("b", "same.mp4"))
+
+    assert asyncio.run(run_jobs()) == ["a", "b"]
+    assert processor._video_locks == {}
@@ -1,7 +1,8 @@
+import os
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
-from src.utils.directory_utils import get_root_directory, setup_directories
+from src.utils.directory_utils import get_root_directory, setup_directories, copy_video_to_raw, get_file_signature
 
 @pytest.fixture
 def mock_project_structure(tmp_path):
@@ -35,4 +36,37 @@ def test_setup_directories_handles_existing(tmp_path):
         
         # Should not raise an exception
         directories = setup_directories()
-        assert directories['data'].exists()
\ No newline at end of file
+        assert directories['data'].exists()
+
+def test_copy_video_to_raw_keeps_source(tmp_path):
+    """copy_video_to_raw places the video in raw without consuming the source."""
+    source = tmp_path / "upload.mp4"
+    source.write_bytes(b"video")
+    with patch('src.utils.directory_utils.get_root_directory', return_value=tmp_path):
+        dest = copy_video_to_raw(str(source), "abc")
+        dest_again = copy_video_to_raw(str(source), "abc")
+    assert dest == dest_again == tmp_path / 'data' / 'raw' / 'abc' / 'abc.mp4'
+    assert dest.read_bytes() == b"video"
+    assert source.exists()
+
+def test_copy_video_to_raw_same_file_is_kept(tmp_path):
+    """Copying a raw video onto itself leaves it untouched."""
+    with patch('src.utils.directory_utils.get_root_directory', return_value=tmp_path):
+        dest = tmp_path / 'data' / 'raw' / 'abc' / 'abc.mp4'
+        dest.parent.mkdir(parents=True)
+        dest.write_bytes(b"video")
+        assert copy_video_to_raw(str(dest), "abc") == dest
+    assert dest.read_bytes() == b"video"
+    assert list(dest.parent.iterdir()) == [dest]
+
+def test_file_signature_changes_when_content_is_replaced(tmp_path):
+    """A replaced input is detected even if it keeps the original mtime."""
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"video")
+    before = get_file_signature(path)
+    replacement = tmp_path / "new.mp4"
+    replacement.write_bytes(b"other video")
+    stat = path.stat()
+    os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(replacement, path)
+    assert get_file_signature(path) != before
@@ -0,0 +1,52 @@
+from src.models.scene import Scene, SceneCollection
+
+def make_collection(bounds):
+    collection = SceneCollection(video_id="test")
+    for i, (start, end) in enumerate(bounds):
+        collection.add_scene(Scene(id=f"s{i}", start_time=start, end_time=end))
+    return collection
+
+def test_get_scene_at_time_matches_linear_scan():
+    """Binary search returns the same scene as scanning the collection."""
+    collection = make_collection([(0, 1000), (1000, 2500), (3000, 4000)])
+    for timestamp in [-1, 0, 500, 1000, 1001, 2500, 2700, 3000, 4000, 4001]:
+        expected = next((s for s in collection.scenes if s.start_time <= timestamp <= s.end_time), None)
+        assert collection.get_scene_at_time(timestamp) is expected
+
+def test_get_scene_at_time_handles_unsorted_scenes():
+    """Scenes added out of order or assigned directly are still found."""
+    collection = make_collection([(2000, 3000), (0, 1000)])
+    assert collection.get_scene_at_time(500).id == "s1"
+    collection.scenes.append(Scene(id="late", start_time=1500, end_time=1800))
+    assert collection.get_scene_at_time(1600).id == "late"
+
+def test_scene_round_trips_through_dict():
+    """from_dict accepts to_dict output, including the derived duration."""
+    scene = Scene(id="a", start_time=100, end_time=400, description="Una calle")
+    data = scene.to_dict()
+    assert data["duration_ms"] == 300
+    assert Scene.from_dict(data) == scene
+
+def test_get_scene_at_time_sees_replacements_and_edits():
+    """Same-length replacements and start_time edits invalidate the index."""
+    collection = make_collection([(0, 1000), (1000, 2000)])
+    assert collection.get_scene_at_time(1500).id == "s1"
+    collection.scenes[1] = Scene(id="new", start_time=1200, end_time=2000)
+    assert collection.get_scene_at_time(1100) is None
+    assert collection.get_scene_at_time(1500).id == "new"
+    collection.scenes[1].start_time = 1600
+    assert collection.get_scene_at_time(1500) is None
+    collection.scenes = [Scene(id="only", start_time=0, end_time=5000)]
+    assert collection.get_scene_at_time(1500).id == "only"
+
+def test_add_scene_keeps_index_when_other_scenes_are_built():
+    """Creating unrelated scenes does not force the index to be rebuilt."""
+    collection = make_collection([(0, 1000)])
+    collection.get_scene_at_time(500)
+    other = SceneCollection("other")
+    other.add_scene(Scene(id="x", start_time=0, end_time=10))
+    other.scenes[0].start_time = 5
+    collection.add_scene(Scene(id="s1", start_time=1000, end_time=2000))
+    assert collection._index_key == collection.scenes.version
+    assert [scene.id for scene in collection._sorted] == ["s0", "s1"]
+    assert collection.get_scene_at_time(1500).id == "s1"
@@ -0,0 +1,65 @@
+import shutil
+import subprocess
+import numpy as np
+import pytest
+
+from src.core.speech_processor import SpeechProcessor
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not available")
+
+@pytest.fixture
+def processor():
+    """SpeechProcessor; Whisper is only loaded on first transcription."""
+    return SpeechProcessor(settings=None)
+
+@pytest.fixture
+def cut_video(tmp_path):
+    """Create a 6 second video with a hard cut at 3 seconds."""
+    path = tmp_path / "cut.mp4"
+    subprocess.run([
+        "ffmpeg", "-v", "error", "-y",
+        "-f", "lavfi", "-i", "color=red:s=640x360:d=3,format=yuv420p",
+        "-f", "lavfi", "-i", "testsrc2=s=640x360:d=3",
+        "-filter_complex", "[0][1]concat=n=2",
+        str(path)
+    ], check=True)
+    return path
+
+def test_detect_scenes_finds_cut(processor, cut_video):
+    """The hard cut is detected once, at the 3 second mark."""
+    assert processor.detect_scenes(cut_video) == [pytest.approx(3000.0)]
+
+def test_volume_profile_matches_pydub_dbfs():
+    """Vectorized window dBFS matches slicing the AudioSegment window by window."""
+    from pydub import AudioSegment
+    from pydub.generators import Sine
+    audio = (AudioSegment.silent(2000, 16000)
+             + Sine(440).to_audio_segment(3000, -20).set_frame_rate(16000)
+             + Sine(440).to_audio_segment(3000, -3).set_frame_rate(16000)).set_channels(1)
+    energy = SpeechProcessor._cumulative_energy(np.array(audio.get_array_of_samples()))
+    starts, profile = SpeechProcessor._volume_profile(
+        energy, audio.frame_rate, audio.max_possible_amplitude, 1500, len(audio), 1000, 250
+    )
+    segment = audio[1500:]
+    expected = [segment[s:s + 1000].dBFS for s in range(0, len(segment) - 1000, 250)]
+    assert starts.tolist() == list(range(1500, len(audio) - 1000, 250))
+    assert np.allclose(profile, expected, atol=0.05)
+
+@pytest.mark.skipif(shutil.which("ffprobe") is None, reason="ffprobe not available")
+def test_load_audio_is_extracted_once(processor, tmp_path):
+    """The audio track is decoded once per video until close_audio drops it."""
+    video = tmp_path / "tone.mp4"
+    subprocess.run([
+        "ffmpeg", "-v", "error", "-y",
+        "-f", "lavfi", "-i", "testsrc2=s=320x180:d=2",
+        "-f", "lavfi", "-i", "sine=f=440:d=2",
+        "-shortest", str(video)
+    ], check=True)
+
+    audio = processor._load_audio(video)
+    assert processor._load_audio(video) is audio
+    assert audio.frame_rate == 16000 and audio.channels == 1
+    assert abs(len(audio) - 2000) < 50
+
+    processor.close_audio(video)
+    assert processor._load_audio(video) is not audio
@@ -0,0 +1,71 @@
+import numpy as np
+import cv2
+from PIL import Image
+from src.core.text_processor import TextProcessor
+
+def test_encode_jpeg_roundtrip():
+    """BGR frames are encoded to JPEG bytes that decode to the same shape."""
+    frame = np.full((48, 64, 3), (200, 150, 100), dtype=np.uint8)
+    data = TextProcessor._encode_jpeg(frame)
+    assert data[:2] == b"\xff\xd8"
+    decoded = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    assert decoded.shape == frame.shape
+
+def test_image_part_for_ndarray_and_pil():
+    """ndarrays become JPEG blobs while PIL images are passed through."""
+    part = TextProcessor._to_image_part(np.zeros((8, 8, 3), dtype=np.uint8))
+    assert part["mime_type"] == "image/jpeg"
+    image = Image.new("RGB", (8, 8))
+    assert TextProcessor._to_image_part(image) is image
+
+class _FakeResponse:
+    text = "En esta escena una persona camina por la calle."
+
+class _FakeVisionModel:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, parts):
+        self.calls += 1
+        return _FakeResponse()
+
+class _Settings:
+    def __init__(self, data_dir):
+        self.DATA_DIR = data_dir
+
+def test_descriptions_are_cached_on_disk(tmp_path):
+    """Identical frames hit the on-disk cache, even from a new processor."""
+    frame = np.full((48, 64, 3), 80, dtype=np.uint8)
+    model = _FakeVisionModel()
+
+    processor = TextProcessor(_Settings(tmp_path))
+    processor.vision_model = model
+    first = processor.generate_description(frame, 5000)
+
+    processor = TextProcessor(_Settings(tmp_path))
+    processor.vision_model = model
+    second = processor.generate_description(frame.copy(), 5000)
+
+    assert first == second == _FakeResponse.text
+    assert model.calls == 1
+
+def test_cache_keeps_only_the_newest_entries(tmp_path, monkeypatch):
+    """Past CACHE_MAX_ENTRIES the oldest descriptions are evicted first."""
+    monkeypatch.setattr(TextProcessor, "CACHE_MAX_ENTRIES", 2)
+    monkeypatch.setattr(TextProcessor, "CACHE_PRUNE_EVERY", 1)
+    processor = TextProcessor(_Settings(tmp_path))
+    for key in ("a", "b", "c"):
+        processor._cache_set(key, key.upper())
+    assert processor._cache_get("a") is None
+    assert processor._cache_get("b") == "B"
+    assert processor._cache_get("c") == "C"
+
+def test_cache_errors_are_treated_as_misses(tmp_path):
+    """A failing cache never replaces a real description with the fallback."""
+    frame = np.full((48, 64, 3), 30, dtype=np.uint8)
+    model = _FakeVisionModel()
+    processor = TextProcessor(_Settings(tmp_path / "broken"))
+    processor._cache.conn.execute("DROP TABLE descriptions")
+    processor.vision_model = model
+    assert processor.generate_description(frame, 5000) == _FakeResponse.text
+    assert model.calls == 1
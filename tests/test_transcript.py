@@ -0,0 +1,64 @@
+import pytest
+from src.models.transcript import Transcript
+
+def test_srt_timestamps_round_trip_exactly():
+    """Timestamp conversion is exact in both directions, without float rounding."""
+    transcript = Transcript()
+    for ms in [0, 1, 999, 1001, 59999, 3600000 + 61001, 10 * 3600000 + 7]:
+        assert transcript._srt_timestamp_to_ms(transcript._ms_to_srt_timestamp(ms)) == ms
+    assert transcript._srt_timestamp_to_ms("00:00:01.001") == 1001
+
+def test_from_srt_round_trips_multiline_cues():
+    """from_srt reads back what to_srt writes, keeping multi-line text."""
+    original = Transcript()
+    original.add_segment(0, 1500, "Hola")
+    original.add_segment(1500, 4001, "Dos\nlíneas")
+    parsed = Transcript()
+    parsed.from_srt(original.to_srt())
+    assert parsed.segments == original.segments
+
+def test_add_segment_continues_ids_after_loading():
+    """New segments get the next id after segments loaded from JSON."""
+    source = Transcript()
+    source.add_segment(0, 1000, "uno")
+    source.add_segment(1000, 2000, "dos")
+    transcript = Transcript()
+    transcript.from_json(source.to_json())
+    transcript.add_segment(2000, 3000, "tres")
+    assert [segment["id"] for segment in transcript.segments] == ["1", "2", "3"]
+
+def test_duration_and_word_count_follow_updates():
+    """Cached duration and word count stay in sync with segment edits."""
+    transcript = Transcript()
+    transcript.add_segment(0, 1000, "uno dos")
+    transcript.add_segment(1000, 5000, "tres")
+    assert (transcript.get_duration(), transcript.get_word_count()) == (5000, 3)
+    transcript.update_segment("2", text="tres cuatro cinco", end=2000)
+    assert (transcript.get_duration(), transcript.get_word_count()) == (2000, 5)
+    assert Transcript().get_duration() == 0
+
+def test_srt_timestamp_accepts_short_fractions():
+    """Short millisecond fields are decimal fractions, as float parsing read them."""
+    transcript = Transcript()
+    assert transcript._srt_timestamp_to_ms("00:00:01,5") == 1500
+    assert transcript._srt_timestamp_to_ms("00:00:01.05") == 1050
+    assert transcript._srt_timestamp_to_ms("00:00:01") == 1000
+
+def test_srt_timestamp_rejects_malformed_input():
+    """Malformed timestamps raise ValueError rather than AttributeError."""
+    with pytest.raises(ValueError):
+        Transcript()._srt_timestamp_to_ms("not a timestamp")
+
+@pytest.mark.parametrize("srt", [
+    "\ufeff1\n00:00:00,000 --> 00:00:01,500\nHola\n\n2\n00:00:01,500 --> 00:00:03,000\nAdiós\n",
+    "1 \n00:00:00,000 --> 00:00:01,500\nHola\n\n2\t\n00:00:01,500 --> 00:00:03,000\nAdiós\n",
+    "1\r\n00:00:00,000 --> 00:00:01,500\r\nHola\r\n\r\n2\r\n00:00:01,500 --> 00:00:03,000\r\nAdiós\r\n",
+    "1\n00:00:00,0 --> 00:00:01,5\nHola\n\n2\n00:00:01,5 --> 00:00:03,0\nAdiós\n",
+])
+def test_from_srt_tolerates_real_world_files(srt):
+    """BOMs, CRLF, trailing spaces after the index and short fractions keep every cue."""
+    transcript = Transcript()
+    transcript.from_srt(srt)
+    assert [(s["start"], s["end"], s["text"]) for s in transcript.segments] == [
+        (0, 1500, "Hola"), (1500, 3000, "Adiós")
+    ]
@@ -0,0 +1,88 @@
+import time
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+from src.core.video_analyzer import VideoAnalyzer
+
+@pytest.fixture
+def random_frame():
+    """Create a reproducible random BGR frame."""
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, size=(120, 160, 3), dtype=np.uint8)
+
+def test_frame_hash_matches_for_pil_and_ndarray(random_frame):
+    """The same frame hashes identically as BGR ndarray or RGB PIL image."""
+    pil_frame = Image.fromarray(random_frame[..., ::-1].copy())
+    assert VideoAnalyzer.frame_hash(random_frame) == VideoAnalyzer.frame_hash(pil_frame)
+
+def test_frame_hash_tolerates_small_noise(random_frame):
+    """Slight noise keeps the perceptual hash within the duplicate distance."""
+    noisy = np.clip(random_frame.astype(np.int16) + 2, 0, 255).astype(np.uint8)
+    distance = VideoAnalyzer.hash_distance(
+        VideoAnalyzer.frame_hash(random_frame),
+        VideoAnalyzer.frame_hash(noisy)
+    )
+    assert distance <= 8
+
+def test_hash_distance_counts_differing_bits():
+    """Hamming distance counts the differing bits."""
+    assert VideoAnalyzer.hash_distance(0b1010, 0b0110) == 2
+    assert VideoAnalyzer.hash_distance(2**64 - 1, 0) == 64
+
+def test_read_frames_preallocates_one_tensor():
+    """Placeholder videos return an (N, H, W, 3) BGR tensor in request order."""
+    frames = VideoAnalyzer(None).read_frames("test123.mp4", [2000, 0, 1000])
+    assert frames.shape == (3, 480, 640, 3)
+    assert frames.dtype == np.uint8
+    assert tuple(frames[0, 0, 0]) == (200, 150, 100)
+
+def test_iter_frames_yields_timestamps_in_batches():
+    """iter_frames pairs every timestamp with its frame across batches."""
+    timestamps = [0, 1000, 2000, 3000, 4000]
+    frames = list(VideoAnalyzer(None).iter_frames("test123.mp4", timestamps, batch_size=2))
+    assert [t for t, _ in frames] == timestamps
+    assert all(frame.shape == (480, 640, 3) for _, frame in frames)
+
+def test_iter_frames_close_waits_for_prefetch(monkeypatch):
+    """Closing the generator early waits for the in-flight prefetch read."""
+    analyzer = VideoAnalyzer(None)
+    read_frames = analyzer.read_frames
+    in_flight = []
+
+    def slow_read(video_path, timestamps_ms):
+        in_flight.append(1)
+        time.sleep(0.2)
+        frames = read_frames(video_path, timestamps_ms)
+        in_flight.pop()
+        return frames
+
+    monkeypatch.setattr(analyzer, "read_frames", slow_read)
+    frames = analyzer.iter_frames("test123.mp4", [0, 1000, 2000, 3000], batch_size=2)
+    next(frames)
+    frames.close()
+    assert in_flight == []
+
+def test_open_captures_are_bounded(monkeypatch):
+    """Past MAX_OPEN_CAPTURES the least recently used capture is released."""
+    class FakeCapture:
+        def __init__(self, path, *args):
+            self.path = path
+            self.released = False
+
+        def isOpened(self):
+            return not self.released
+
+        def release(self):
+            self.released = True
+
+    monkeypatch.setattr(cv2, "VideoCapture", FakeCapture)
+    monkeypatch.setattr(VideoAnalyzer, "MAX_OPEN_CAPTURES", 2)
+    analyzer = VideoAnalyzer(None)
+    first = analyzer._get_capture("a.mp4")
+    second = analyzer._get_capture("b.mp4")
+    assert analyzer._get_capture("a.mp4") is first
+    third = analyzer._get_capture("c.mp4")
+    assert second.released and not first.released and not third.released
+    analyzer.close()
+    assert first.released and third.released